@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 
@@ -25,10 +26,13 @@ class PepperBot(commands.Bot):
         self.db = Database()
 
     async def setup_hook(self):
+        # Only Pepper.pl goes through this session, so cap per host and leave the
+        # global pool unbounded; request pacing is handled by the alerts rate limiter.
         connector = aiohttp.TCPConnector(
-            limit=50,
-            limit_per_host=10,
+            limit=0,
+            limit_per_host=30,
             ttl_dns_cache=600,
+            keepalive_timeout=75,
             enable_cleanup_closed=True,
             force_close=False,
         )
@@ -98,12 +102,26 @@ class PepperBot(commands.Bot):
             await ctx.send(embed=embed)
 
 
+def install_uvloop() -> bool:
+    """Use uvloop's libuv event loop when it is installed (not available on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 def main():
     token = os.getenv("DISCORD_BOT_TOKEN")
     if not token:
         logger.error("DISCORD_BOT_TOKEN not found in .env file!")
         return
 
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
+
     bot = PepperBot()
 
     try:
@@ -3,7 +3,7 @@ import datetime
 import logging
 from collections import defaultdict
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 import discord
 from discord import app_commands
@@ -11,14 +11,27 @@ from discord.ext import commands, tasks
 
 from utils.alerts import AlertsManager
 from utils.category_manager import CategoryManager
-from utils.config import Config
+from utils.config import (
+    COLOR_NEUTRAL,
+    COLOR_PRIMARY,
+    COLOR_SUCCESS,
+    COLOR_WARNING,
+    DEFAULT_SEARCH_LIMIT,
+    FLIGHT_CHANNEL_ID,
+    FLIGHT_SCHEDULE_HOUR,
+    WATCH_INTERVAL_MINUTES,
+)
+from utils.deal_filter import DealFilter
+from utils.models import Category
 from utils.scraper import PepperScraper
 from utils.views import DealPaginator
 
 logger = logging.getLogger("PepperBot.Cogs")
 
 CATEGORY_STAGGER_DELAY = 2
+CATEGORY_SCHEDULER_ERROR_BACKOFF = 60
 MAX_DEALS_PER_NOTIFICATION = 10
+MAX_CONCURRENT_DMS = 10
 MAX_CATEGORIES_PER_GUILD = 20
 CLEANUP_INTERVAL_HOURS = 24
 CLEANUP_DAYS_OLD = 30
@@ -50,6 +63,7 @@ class PepperCommands(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self.scraper = PepperScraper(self.bot.session)
         self.alerts_manager = AlertsManager(self.bot.db)
         self.category_manager = CategoryManager(self.bot.db)
 
@@ -64,7 +78,7 @@ class PepperCommands(commands.Cog):
         self.category_notification_task.cancel()
         self.cleanup_task.cancel()
 
-    @tasks.loop(time=datetime.time(hour=Config.FLIGHT_SCHEDULE_HOUR, minute=0))
+    @tasks.loop(time=datetime.time(hour=FLIGHT_SCHEDULE_HOUR, minute=0))
     async def flight_deals_task(self):
         await self.process_flight_deals(manual_trigger=False)
 
@@ -72,7 +86,7 @@ class PepperCommands(commands.Cog):
     async def before_flight_task(self):
         await self.bot.wait_until_ready()
 
-    @tasks.loop(minutes=Config.WATCH_INTERVAL_MINUTES)
+    @tasks.loop(minutes=WATCH_INTERVAL_MINUTES)
     async def alerts_task(self):
         await self.process_alerts()
 
@@ -80,36 +94,35 @@ class PepperCommands(commands.Cog):
     async def before_alerts_task(self):
         await self.bot.wait_until_ready()
 
-    @tasks.loop(minutes=1)
+    @tasks.loop()
     async def category_notification_task(self):
         try:
-            categories = await self.bot.db.get_active_categories_for_schedule()
-            
-            if not categories:
-                return
-            
-            logger.info(f"Checking {len(categories)} active categories for scheduled runs")
-            
-            to_process = [cat for cat in categories if self.category_manager.should_run_now(cat)]
+            to_process = await self.category_manager.wait_for_due_categories()
             
             if not to_process:
                 return
             
             logger.info(f"Processing {len(to_process)} categories")
             
+            stats_rows = []
             for i, category in enumerate(to_process):
                 try:
                     if i > 0:
                         await asyncio.sleep(CATEGORY_STAGGER_DELAY)
                     
-                    await self.process_category_notification(category)
+                    stats = await self.process_category_notification(category)
+                    if stats:
+                        stats_rows.append(stats)
                     
                 except Exception as e:
-                    logger.error(f"Error processing category {category['slug']}: {e}", exc_info=True)
-                    await self.bot.db.update_category_stats(category['id'], 0, 0, errors=1)
+                    logger.error(f"Error processing category {category.slug}: {e}", exc_info=True)
+                    stats_rows.append((category.id, 0, 0, 1))
+            
+            await self.bot.db.update_category_stats_batch(stats_rows)
         
         except Exception as e:
             logger.error(f"Error in category notification task: {e}", exc_info=True)
+            await asyncio.sleep(CATEGORY_SCHEDULER_ERROR_BACKOFF)
     
     @category_notification_task.before_loop
     async def before_category_task(self):
@@ -122,6 +135,7 @@ class PepperCommands(commands.Cog):
             
             deleted_deals = await self.bot.db.cleanup_old_deals(days=CLEANUP_DAYS_OLD)
             deleted_category_deals = await self.bot.db.cleanup_category_deals(days=CLEANUP_DAYS_OLD)
+            await self.bot.db.optimize()
             
             logger.info(
                 f"Cleanup complete: {deleted_deals} flight deals, "
@@ -204,11 +218,11 @@ class PepperCommands(commands.Cog):
         return '🌋' if temp > 500 else ('🔥' if temp > 300 else '❄️')
 
     async def _add_alert_shared(self, user_id: int, query: str, max_price: Optional[float]) -> tuple[bool, str]:
-        current = await self.alerts_manager.get_alerts(user_id)
+        current = await self.bot.db.get_user_alerts(user_id)
         if len(current) >= 10:
             return False, "❌ Max 10 alerts. Remove some first."
         
-        added = await self.alerts_manager.add_alert(user_id, query, max_price)
+        added = await self.bot.db.add_alert(user_id, query, max_price)
         
         if not added:
             return False, "⚠️ Error adding alert."
@@ -220,7 +234,7 @@ class PepperCommands(commands.Cog):
         return True, msg
 
     async def _remove_alert_shared(self, user_id: int, query: str) -> tuple[bool, str]:
-        removed = await self.alerts_manager.remove_alert(user_id, query)
+        removed = await self.bot.db.remove_alert(user_id, query)
         
         if removed:
             return True, f"🗑️ Stopped watching: **{query}**"
@@ -231,7 +245,7 @@ class PepperCommands(commands.Cog):
         embed = discord.Embed(
             title="🔔 Your Alerts",
             description="Watching these queries:",
-            color=Config.COLOR_PRIMARY,
+            color=COLOR_PRIMARY,
         )
         
         for i, a in enumerate(alerts, 1):
@@ -241,28 +255,28 @@ class PepperCommands(commands.Cog):
         embed.set_footer(text="Use p unwatch:query to remove")
         return embed
 
-    def _build_category_list_embed(self, categories: List[Dict]) -> discord.Embed:
+    def _build_category_list_embed(self, categories: List[Category]) -> discord.Embed:
         embed = discord.Embed(
             title="📋 Active Categories",
             description=f"Managing {len(categories)} automated notifications",
-            color=Config.COLOR_PRIMARY
+            color=COLOR_PRIMARY
         )
         
         for i, cat in enumerate(categories, 1):
-            emoji = self.category_manager.get_category_emoji(cat['slug'])
+            emoji = self.category_manager.get_category_emoji(cat.slug)
             
             filters = []
-            if cat.get('min_temperature', 0) > 0:
-                filters.append(f"🌡️ Min: {cat['min_temperature']}°")
-            if cat.get('max_price'):
-                filters.append(f"💰 Max: {cat['max_price']} zł")
+            if cat.min_temperature > 0:
+                filters.append(f"🌡️ Min: {cat.min_temperature}°")
+            if cat.max_price:
+                filters.append(f"💰 Max: {cat.max_price} zł")
             
             filter_str = " | ".join(filters) if filters else "No filters"
             schedule_str = self.category_manager.format_schedule(cat)
-            status_emoji = "✅" if cat['status'] == 'active' else "⏸️"
+            status_emoji = "✅" if cat.status == 'active' else "⏸️"
             
-            value = f"{status_emoji} {schedule_str}\n📍 <#{cat['channel_id']}>\n{filter_str}"
-            name = f"{i}. {emoji} {cat['slug']}"
+            value = f"{status_emoji} {schedule_str}\n📍 <#{cat.channel_id}>\n{filter_str}"
+            name = f"{i}. {emoji} {cat.slug}"
             
             embed.add_field(name=name, value=value, inline=False)
         
@@ -279,7 +293,7 @@ class PepperCommands(commands.Cog):
         date: Optional[int],
         min_temp: int,
         max_price: Optional[float]
-    ) -> tuple[bool, Optional[str], Optional[int]]:
+    ) -> tuple[bool, Optional[str], Optional[Category]]:
         slug = slug.lower().strip()
         
         existing = await self.bot.db.get_category_by_slug(guild_id, slug)
@@ -317,7 +331,9 @@ class PepperCommands(commands.Cog):
         if not category_id:
             return False, "❌ Database error.", None
         
-        return True, None, category_id
+        self.category_manager.invalidate_schedule()
+        category = await self.bot.db.get_category_by_slug(guild_id, slug)
+        return True, None, category
 
     @text_command_error_handler
     async def _handle_watch_command(self, message: discord.Message, content: str):
@@ -347,7 +363,7 @@ class PepperCommands(commands.Cog):
 
     @text_command_error_handler
     async def _handle_list_command(self, message: discord.Message):
-        alerts = await self.alerts_manager.get_alerts(message.author.id)
+        alerts = await self.bot.db.get_user_alerts(message.author.id)
         
         if not alerts:
             await message.reply("🔭 No active alerts.", delete_after=10)
@@ -367,8 +383,6 @@ class PepperCommands(commands.Cog):
         error_msg: str
     ):
         try:
-            from utils.deal_filter import DealFilter
-            
             result = await scraper_method(*method_args)
             
             if not result["success"]:
@@ -408,7 +422,7 @@ class PepperCommands(commands.Cog):
         await self._handle_search_generic(
             message,
             self.scraper.search_deals,
-            (query, Config.DEFAULT_SEARCH_LIMIT),
+            (query, DEFAULT_SEARCH_LIMIT),
             f"**🌶️ Found {{count}} deals for: {query}**",
             f"🤷 No deals found for: **{query}**"
         )
@@ -417,7 +431,7 @@ class PepperCommands(commands.Cog):
         await self._handle_search_generic(
             message,
             self.scraper.get_hot_deals,
-            (Config.DEFAULT_SEARCH_LIMIT,),
+            (DEFAULT_SEARCH_LIMIT,),
             "**🔥 Top {count} hot deals!**",
             "🤷 No hot deals found."
         )
@@ -432,7 +446,7 @@ class PepperCommands(commands.Cog):
         await self._handle_search_generic(
             message,
             self.scraper.get_group_deals,
-            (slug, Config.DEFAULT_SEARCH_LIMIT),
+            (slug, DEFAULT_SEARCH_LIMIT),
             f"**📂 Top {{count}} deals from: {slug}**",
             f"🤷 No deals in category: **{slug}**"
         )
@@ -459,7 +473,7 @@ class PepperCommands(commands.Cog):
         embed = discord.Embed(
             title=f"✅ Preview: {slug}",
             description=f"Latest {len(deals)} deals:",
-            color=Config.COLOR_SUCCESS
+            color=COLOR_SUCCESS
         )
         
         for i, deal in enumerate(deals, 1):
@@ -581,7 +595,7 @@ class PepperCommands(commands.Cog):
             elif part.isdigit() and 1 <= int(part) <= 31 and frequency == 'monthly':
                 date = int(part)
         
-        success, error, category_id = await self._validate_and_create_category(
+        success, error, category = await self._validate_and_create_category(
             message.guild.id, slug, channel, frequency, time, day, date, min_temp, max_price
         )
         
@@ -590,10 +604,9 @@ class PepperCommands(commands.Cog):
             return
         
         emoji = self.category_manager.get_category_emoji(slug)
-        schedule = {'type': frequency, 'time': time, 'day': day, 'date': date}
         
         msg = f"✅ Category added: {emoji} **{slug}**\n"
-        msg += f"📅 {self.category_manager.format_schedule(schedule)}\n"
+        msg += f"📅 {self.category_manager.format_schedule(category)}\n"
         msg += f"📍 {channel.mention}"
         
         await message.reply(msg, delete_after=30)
@@ -608,6 +621,8 @@ class PepperCommands(commands.Cog):
             return
         
         removed = await self.bot.db.remove_category_config(message.guild.id, slug)
+        if removed:
+            self.category_manager.invalidate_schedule()
         
         msg = f"🗑️ Removed category: **{slug}**" if removed else f"⚠️ Category **{slug}** not found."
         await message.reply(msg, delete_after=10)
@@ -618,6 +633,8 @@ class PepperCommands(commands.Cog):
         slug = slug.strip().lower()
         
         updated = await self.bot.db.update_category_status(message.guild.id, slug, new_status)
+        if updated:
+            self.category_manager.invalidate_schedule()
         
         status_emoji = "⏸️" if new_status == 'paused' else "▶️"
         status_text = "Paused" if new_status == 'paused' else "Resumed"
@@ -636,90 +653,104 @@ class PepperCommands(commands.Cog):
             return
         
         await message.reply(f"⚡ Triggering: **{slug}**...", delete_after=5)
-        await self.process_category_notification(category, manual_trigger=True)
+        await self._trigger_category(category)
         await self.safe_delete_message(message)
     
+    async def _trigger_category(self, category: Category, interaction: discord.Interaction = None):
+        stats = await self.process_category_notification(
+            category, manual_trigger=True, interaction=interaction
+        )
+        if stats:
+            await self.bot.db.update_category_stats_batch([stats])
+        # A manual run moves last_run, which can suppress the next scheduled slot
+        self.category_manager.invalidate_schedule()
+    
     async def process_category_notification(
         self,
-        category: Dict[str, Any],
+        category: Category,
         manual_trigger: bool = False,
         interaction: discord.Interaction = None
-    ):
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """Post new deals for a category.
+        
+        Returns the (category_id, deals_found, deals_sent, errors) stats row for the
+        caller to record, or None when nothing should be recorded.
+        """
         try:
-            channel = self.bot.get_channel(category['channel_id'])
+            channel = self.bot.get_channel(category.channel_id)
             if not channel:
-                logger.warning(f"Channel {category['channel_id']} not found for category {category['slug']}")
+                logger.warning(f"Channel {category.channel_id} not found for category {category.slug}")
                 if not manual_trigger:
                     await self.bot.db.update_category_status(
-                        category['guild_id'], category['slug'], 'disabled'
+                        category.guild_id, category.slug, 'disabled'
                     )
+                    self.category_manager.invalidate_schedule()
                 return
             
-            result = await self.scraper.get_group_deals(category['slug'], limit=20)
+            result = await self.scraper.get_group_deals(category.slug, limit=20)
             
             if not result['success']:
                 error_detail = result.get('error', 'Unknown error')
-                logger.error(f"Failed to scrape {category['slug']}: {error_detail}")
+                logger.error(f"Failed to scrape {category.slug}: {error_detail}")
                 if interaction:
                     await interaction.followup.send(
                         "❌ Failed to fetch deals. Please try again later.", ephemeral=True
                     )
-                await self.bot.db.update_category_stats(category['id'], 0, 0, errors=1)
-                return
+                return (category.id, 0, 0, 1)
             
             deals = result['deals']
             if not deals:
-                logger.info(f"No deals found for {category['slug']}")
+                logger.info(f"No deals found for {category.slug}")
                 if interaction:
                     await interaction.followup.send(
-                        f"🤷 No deals found for **{category['slug']}**", ephemeral=True
+                        f"🤷 No deals found for **{category.slug}**", ephemeral=True
                     )
-                await self.bot.db.update_category_stats(category['id'], 0, 0)
-                return
+                return (category.id, 0, 0, 0)
             
             new_deals = []
             batch_to_mark = []
+            already_sent = await self.bot.db.get_category_sent_deal_ids(
+                category.id, [deal['link'] for deal in deals]
+            )
             
             for deal in deals:
                 deal_id = deal['link']
                 
-                if category.get('min_temperature', 0) > 0:
-                    if deal.get('temperature', 0) < category['min_temperature']:
+                if category.min_temperature > 0:
+                    if deal.get('temperature', 0) < category.min_temperature:
                         continue
                 
-                if category.get('max_price'):
+                if category.max_price:
                     deal_price = self._parse_price(deal.get('price'))
-                    if deal_price > 0 and deal_price > category['max_price']:
+                    if deal_price > 0 and deal_price > category.max_price:
                         continue
                 
-                is_sent = await self.bot.db.is_category_deal_sent(category['id'], deal_id)
-                
-                if manual_trigger or not is_sent:
+                if manual_trigger or deal_id not in already_sent:
                     new_deals.append(deal)
                     if not manual_trigger:
-                        batch_to_mark.append((category['id'], deal_id))
+                        batch_to_mark.append((category.id, deal_id))
+                        already_sent.add(deal_id)
             
             if batch_to_mark:
                 await self.bot.db.mark_category_deals_sent_batch(batch_to_mark)
             
             if not new_deals:
-                logger.info(f"No new deals for {category['slug']}")
+                logger.info(f"No new deals for {category.slug}")
                 if interaction:
                     await interaction.followup.send(
-                        f"No new deals since last check for **{category['slug']}**", ephemeral=True
+                        f"No new deals since last check for **{category.slug}**", ephemeral=True
                     )
-                await self.bot.db.update_category_stats(category['id'], len(deals), 0)
-                return
+                return (category.id, len(deals), 0, 0)
             
             new_deals.sort(key=lambda x: x.get('temperature', 0), reverse=True)
             top_deals = new_deals[:MAX_DEALS_PER_NOTIFICATION]
             
-            emoji = self.category_manager.get_category_emoji(category['slug'])
+            emoji = self.category_manager.get_category_emoji(category.slug)
             
             embed = discord.Embed(
-                title=f"{emoji} {category.get('name', category['slug'])}",
+                title=f"{emoji} {category.name or category.slug}",
                 description=f"Found **{len(new_deals)}** new deals. Here are the hottest:",
-                color=Config.COLOR_PRIMARY
+                color=COLOR_PRIMARY
             )
             
             for i, deal in enumerate(top_deals, 1):
@@ -745,15 +776,16 @@ class PepperCommands(commands.Cog):
             
             await channel.send(embed=embed)
             
-            await self.bot.db.update_category_last_run(category['id'])
-            await self.bot.db.update_category_stats(category['id'], len(deals), len(new_deals))
+            await self.bot.db.update_category_last_run(category.id)
             
             if not manual_trigger:
-                logger.info(f"Sent {len(top_deals)} deals for category {category['slug']}")
+                logger.info(f"Sent {len(top_deals)} deals for category {category.slug}")
             elif interaction:
                 await interaction.followup.send(
                     f"✅ Sent {len(top_deals)} deals to {channel.mention}", ephemeral=True
                 )
+            
+            return (category.id, len(deals), len(new_deals), 0)
         
         except Exception as e:
             logger.error(f"Error in category notification: {e}", exc_info=True)
@@ -761,79 +793,92 @@ class PepperCommands(commands.Cog):
                 await interaction.followup.send(
                     "⚠️ An unexpected error occurred. Please try again later.", ephemeral=True
                 )
+            return None
     
     def _parse_price(self, price_str: Optional[str]) -> float:
-        if not price_str:
-            return 0.0
-        try:
-            clean = price_str.lower().replace('zł', '').replace(' ', '').replace(',', '.')
-            if 'darm' in clean or 'free' in clean or 'bezpłatn' in clean:
-                return 0.0
-            return float(clean)
-        except ValueError:
-            return 0.0
+        return DealFilter._parse_price(price_str) or 0.0
 
     async def process_alerts(self):
         try:
             notifications = await self.alerts_manager.check_alerts(self.scraper)
-            
-            grouped = defaultdict(lambda: defaultdict(list))
-            for notif in notifications:
-                grouped[notif["user_id"]][notif["query"]].append(notif["deal"])
-            
-            for user_id, queries_dict in grouped.items():
-                user = self.bot.get_user(user_id)
-                if not user:
-                    try:
-                        user = await self.bot.fetch_user(user_id)
-                    except (discord.NotFound, Exception) as e:
-                        logger.warning(f"Could not fetch user {user_id}: {e}")
-                        continue
-                
-                for query, deals in queries_dict.items():
-                    try:
-                        deals_sorted = sorted(deals, key=lambda d: d.get('temperature', 0), reverse=True)
-                        top_deals = deals_sorted[:5]
-                        
-                        embed = discord.Embed(
-                            title=f"🚨 {len(deals)} {'nowa okazja' if len(deals) == 1 else 'nowych okazji'} dla: {query}",
-                            color=Config.COLOR_SUCCESS
-                        )
-                        
-                        for i, deal in enumerate(top_deals, 1):
-                            temp = deal.get('temperature', 0)
-                            icon = self.get_temperature_icon(temp)
-                            
-                            value = f"💰 **{deal['price']}** | {icon} {temp}°\n[🔗 Zobacz okazję]({deal['link']})"
-                            
-                            embed.add_field(
-                                name=f"{i}. {deal['title'][:70]}...",
-                                value=value,
-                                inline=False
-                            )
-                        
-                        if top_deals[0].get('image_url'):
-                            embed.set_thumbnail(url=top_deals[0]['image_url'])
-                        
-                        embed.set_footer(text="PepperWatch • Sprawdzam co 15 minut")
-                        
-                        await user.send(embed=embed)
-                        logger.info(f"Sent {len(top_deals)} deals to {user.name} for query '{query}'")
-                        
-                        await asyncio.sleep(0.5)
-                    
-                    except discord.Forbidden:
-                        logger.warning(f"Cannot send DM to {user.name} ({user_id})")
-                    except Exception as e:
-                        logger.error(f"Error sending alert to {user_id}: {e}", exc_info=True)
+            await self.dispatch_notifications(notifications)
         
         except Exception as e:
             logger.error(f"Error in alerts task: {e}", exc_info=True)
 
+    async def dispatch_notifications(self, notifications: List[Dict[str, Any]]):
+        """DM alert matches to users concurrently, at most MAX_CONCURRENT_DMS users at a time."""
+        grouped = defaultdict(lambda: defaultdict(list))
+        for notif in notifications:
+            grouped[notif["user_id"]][notif["query"]].append(notif["deal"])
+        
+        sem = asyncio.Semaphore(MAX_CONCURRENT_DMS)
+        
+        async def _send(user_id: int, queries_dict: Dict[str, List[Dict[str, Any]]]):
+            async with sem:
+                await self._send_user_alerts(user_id, queries_dict)
+        
+        results = await asyncio.gather(
+            *[_send(user_id, queries_dict) for user_id, queries_dict in grouped.items()],
+            return_exceptions=True
+        )
+        
+        for user_id, result in zip(grouped, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending alerts to {user_id}: {result}", exc_info=result)
+
+    async def _send_user_alerts(self, user_id: int, queries_dict: Dict[str, List[Dict[str, Any]]]):
+        user = self.bot.get_user(user_id)
+        if not user:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except (discord.NotFound, Exception) as e:
+                logger.warning(f"Could not fetch user {user_id}: {e}")
+                return
+        
+        for query, deals in queries_dict.items():
+            try:
+                deals_sorted = sorted(deals, key=lambda d: d.get('temperature', 0), reverse=True)
+                top_deals = deals_sorted[:5]
+                
+                embed = discord.Embed(
+                    title=f"🚨 {len(deals)} {'nowa okazja' if len(deals) == 1 else 'nowych okazji'} dla: {query}",
+                    color=COLOR_SUCCESS
+                )
+                
+                for i, deal in enumerate(top_deals, 1):
+                    temp = deal.get('temperature', 0)
+                    icon = self.get_temperature_icon(temp)
+                    
+                    value = f"💰 **{deal['price']}** | {icon} {temp}°\n[🔗 Zobacz okazję]({deal['link']})"
+                    
+                    embed.add_field(
+                        name=f"{i}. {deal['title'][:70]}...",
+                        value=value,
+                        inline=False
+                    )
+                
+                if top_deals[0].get('image_url'):
+                    embed.set_thumbnail(url=top_deals[0]['image_url'])
+                
+                embed.set_footer(text="PepperWatch • Sprawdzam co 15 minut")
+                
+                await user.send(embed=embed)
+                logger.info(f"Sent {len(top_deals)} deals to {user.name} for query '{query}'")
+                
+                # Messages to the same user stay sequential and paced; other users run in parallel
+                await asyncio.sleep(0.5)
+            
+            except discord.Forbidden:
+                logger.warning(f"Cannot send DM to {user.name} ({user_id})")
+                return
+            except Exception as e:
+                logger.error(f"Error sending alert to {user_id}: {e}", exc_info=True)
+
     async def process_flight_deals(
         self, manual_trigger: bool = False, interaction: discord.Interaction = None
     ):
-        channel_id = Config.FLIGHT_CHANNEL_ID
+        channel_id = FLIGHT_CHANNEL_ID
 
         target_channel = None
         if interaction:
@@ -867,14 +912,19 @@ class PepperCommands(commands.Cog):
                 return
 
             new_deals = []
+            batch_to_mark = []
+            already_sent = await self.bot.db.get_sent_deal_ids(deal["link"] for deal in deals)
             for deal in deals:
                 deal_id = deal["link"]
-                is_sent = await self.bot.db.is_deal_sent(deal_id)
 
-                if manual_trigger or not is_sent:
+                if manual_trigger or deal_id not in already_sent:
                     new_deals.append(deal)
                     if not manual_trigger:
-                        await self.bot.db.add_sent_deal(deal_id)
+                        batch_to_mark.append(deal_id)
+                        already_sent.add(deal_id)
+
+            if batch_to_mark:
+                await self.bot.db.mark_deals_sent_batch(batch_to_mark)
 
             if not new_deals:
                 logger.info("No new flight deals found.")
@@ -890,7 +940,7 @@ class PepperCommands(commands.Cog):
             embed = discord.Embed(
                 title=f"✈️ Dzienny Raport Lotniczy - {datetime.date.today()}",
                 description=f"Znaleziono **{len(new_deals)}** okazji. Oto najlepsze z nich:",
-                color=Config.COLOR_PRIMARY,
+                color=COLOR_PRIMARY,
             )
 
             for i, deal in enumerate(top_deals, 1):
@@ -921,10 +971,6 @@ class PepperCommands(commands.Cog):
             if interaction:
                 await interaction.followup.send(f"⚠️ Wystąpił błąd: {e}", ephemeral=True)
 
-    @property
-    def scraper(self) -> PepperScraper:
-        return PepperScraper(self.bot.session)
-
     async def _send_deals(
         self,
         interaction: discord.Interaction,
@@ -937,7 +983,7 @@ class PepperCommands(commands.Cog):
                 embed=discord.Embed(
                     title="⚠️ Błąd",
                     description=f"Wystąpił błąd podczas pobierania danych: {result.get('error', 'Nieznany błąd')}",
-                    color=Config.COLOR_WARNING,
+                    color=COLOR_WARNING,
                 )
             )
             return
@@ -946,7 +992,7 @@ class PepperCommands(commands.Cog):
         if not deals:
             await interaction.followup.send(
                 embed=discord.Embed(
-                    title="🤷 Brak wyników", description=title_empty, color=Config.COLOR_NEUTRAL
+                    title="🤷 Brak wyników", description=title_empty, color=COLOR_NEUTRAL
                 )
             )
             return
@@ -962,7 +1008,7 @@ class PepperCommands(commands.Cog):
     @app_commands.describe(query="Czego szukasz? (np. lego, rtx 4070)")
     async def search_pepper(self, interaction: discord.Interaction, query: str):
         await interaction.response.defer()
-        result = await self.scraper.search_deals(query, limit=Config.DEFAULT_SEARCH_LIMIT)
+        result = await self.scraper.search_deals(query, limit=DEFAULT_SEARCH_LIMIT)
 
         await self._send_deals(
             interaction,
@@ -974,7 +1020,7 @@ class PepperCommands(commands.Cog):
     @app_commands.command(name="pepperhot", description="Najgorętsze okazje ze strony głównej")
     async def hot_pepper(self, interaction: discord.Interaction):
         await interaction.response.defer()
-        result = await self.scraper.get_hot_deals(limit=Config.DEFAULT_SEARCH_LIMIT)
+        result = await self.scraper.get_hot_deals(limit=DEFAULT_SEARCH_LIMIT)
 
         await self._send_deals(
             interaction,
@@ -990,7 +1036,7 @@ class PepperCommands(commands.Cog):
     async def group_pepper(self, interaction: discord.Interaction, group: str):
         await interaction.response.defer()
         group = group.lower().strip().replace(" ", "-")
-        result = await self.scraper.get_group_deals(group, limit=Config.DEFAULT_SEARCH_LIMIT)
+        result = await self.scraper.get_group_deals(group, limit=DEFAULT_SEARCH_LIMIT)
 
         await self._send_deals(
             interaction,
@@ -1034,7 +1080,7 @@ class PepperCommands(commands.Cog):
 
     @pepperwatch_group.command(name="list", description="Pokaż moje aktywne powiadomienia")
     async def pw_list(self, interaction: discord.Interaction):
-        alerts = await self.alerts_manager.get_alerts(interaction.user.id)
+        alerts = await self.bot.db.get_user_alerts(interaction.user.id)
         if not alerts:
             await interaction.response.send_message(
                 "🔭 Nie masz żadnych aktywnych powiadomień.", ephemeral=True
@@ -1081,7 +1127,7 @@ class PepperCommands(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
         
-        success, error, category_id = await self._validate_and_create_category(
+        success, error, category = await self._validate_and_create_category(
             interaction.guild_id, slug, channel, frequency, time, day, date, min_temp or 0, max_price
         )
         
@@ -1089,16 +1135,15 @@ class PepperCommands(commands.Cog):
             await interaction.followup.send(error, ephemeral=True)
             return
         
-        emoji = self.category_manager.get_category_emoji(slug)
-        schedule = {'type': frequency, 'time': time, 'day': day, 'date': date}
+        emoji = self.category_manager.get_category_emoji(category.slug)
         
         embed = discord.Embed(
             title="✅ Category Added Successfully!",
-            color=Config.COLOR_SUCCESS
+            color=COLOR_SUCCESS
         )
         
-        embed.add_field(name="📂 Category", value=f"{emoji} **{slug}**", inline=False)
-        embed.add_field(name="📅 Schedule", value=self.category_manager.format_schedule(schedule), inline=False)
+        embed.add_field(name="📂 Category", value=f"{emoji} **{category.slug}**", inline=False)
+        embed.add_field(name="📅 Schedule", value=self.category_manager.format_schedule(category), inline=False)
         embed.add_field(name="📍 Channel", value=channel.mention, inline=False)
         
         if min_temp:
@@ -1127,6 +1172,7 @@ class PepperCommands(commands.Cog):
         
         removed = await self.bot.db.remove_category_config(interaction.guild_id, slug)
         if removed:
+            self.category_manager.invalidate_schedule()
             await interaction.followup.send(
                 f"🗑️ Category removed: **{slug}**\n\nAll notification history has been deleted.",
                 ephemeral=True
@@ -1177,7 +1223,7 @@ class PepperCommands(commands.Cog):
             ephemeral=True
         )
         
-        await self.process_category_notification(category, manual_trigger=True, interaction=interaction)
+        await self._trigger_category(category, interaction=interaction)
     
     @category_group.command(name="pause", description="Pause a category")
     @app_commands.describe(slug="Category to pause")
@@ -1194,6 +1240,7 @@ class PepperCommands(commands.Cog):
         
         updated = await self.bot.db.update_category_status(interaction.guild_id, slug, 'paused')
         if updated:
+            self.category_manager.invalidate_schedule()
             await interaction.response.send_message(
                 f"⏸️ Category paused: **{slug}**\n\nUse `/category resume {slug}` to reactivate.",
                 ephemeral=True
@@ -1212,6 +1259,7 @@ class PepperCommands(commands.Cog):
         
         updated = await self.bot.db.update_category_status(interaction.guild_id, slug, 'active')
         if updated:
+            self.category_manager.invalidate_schedule()
             category = await self.bot.db.get_category_by_slug(interaction.guild_id, slug)
             schedule_str = self.category_manager.format_schedule(category)
             
@@ -1252,7 +1300,7 @@ class PepperCommands(commands.Cog):
         embed = discord.Embed(
             title=f"✅ Category Preview: {slug}",
             description=f"Latest {len(deals)} deals:",
-            color=Config.COLOR_SUCCESS
+            color=COLOR_SUCCESS
         )
         
         for i, deal in enumerate(deals, 1):
@@ -0,0 +1,54 @@
+import asyncio
+import datetime
+
+import pytest
+
+from utils.category_manager import CategoryManager
+from utils.models import Category
+
+
+def _daily_category(category_id: int, schedule_time: str) -> Category:
+    return Category.from_tuple((
+        category_id, 1, f"category-{category_id}", None, 1, "active",
+        "daily", schedule_time, None, None, 0, None, 0,
+    ))
+
+
+class _GatedDatabase:
+    """Holds the first category read open until the test releases it."""
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.calls = 0
+        self.first_read_started = asyncio.Event()
+        self.release_first_read = asyncio.Event()
+
+    async def get_active_categories_for_schedule(self):
+        self.calls += 1
+        snapshot = list(self.categories)
+        if self.calls == 1:
+            self.first_read_started.set()
+            await self.release_first_read.wait()
+        return snapshot
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_rebuild_triggers_another_rebuild():
+    now = datetime.datetime.now()
+    later = (now + datetime.timedelta(hours=3)).strftime("%H:%M")
+    db = _GatedDatabase([_daily_category(1, later)])
+    manager = CategoryManager(db)
+
+    waiter = asyncio.create_task(manager.wait_for_due_categories())
+    await asyncio.wait_for(db.first_read_started.wait(), timeout=1)
+
+    # A category added while the first rebuild is still reading, due this minute
+    added = _daily_category(2, now.strftime("%H:%M"))
+    db.categories.append(added)
+    manager.invalidate_schedule()
+    db.release_first_read.set()
+
+    due = await asyncio.wait_for(waiter, timeout=1)
+
+    assert [category.id for category in due] == [added.id]
+    assert db.calls == 2
@@ -0,0 +1,29 @@
+import pytest
+import pytest_asyncio
+
+from utils.db import Database
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    database = Database(str(tmp_path / "pepperbot.db"))
+    await database.init()
+    yield database
+    await database.close()
+
+
+async def _write_outside_tx(db: Database):
+    async with db.transaction() as tx:
+        await tx.mark_sent("https://www.pepper.pl/promocje/1")
+        await db.mark_deals_sent_batch(["https://www.pepper.pl/promocje/2"])
+
+
+@pytest.mark.asyncio
+async def test_writer_inside_transaction_raises_instead_of_deadlocking(db):
+    with pytest.raises(RuntimeError):
+        await _write_outside_tx(db)
+
+    # The failed block rolled back, and the writer is free again
+    await db.mark_deals_sent_batch(["https://www.pepper.pl/promocje/3"])
+    sent = await db.get_sent_deal_ids([f"https://www.pepper.pl/promocje/{i}" for i in (1, 2, 3)])
+    assert sent == {"https://www.pepper.pl/promocje/3"}
@@ -1,49 +1,56 @@
 import asyncio
 import datetime
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Tuple
+
+from aiolimiter import AsyncLimiter
 
 from .db import Database
 
 logger = logging.getLogger("PepperBot.Alerts")
 
+MAX_CONCURRENT_QUERIES = 5
+# Token bucket for Pepper.pl searches: bursts up to 10 requests, 10 per 15 seconds sustained
+SEARCH_RATE_LIMIT = 10
+SEARCH_RATE_PERIOD_SECONDS = 15
+
 
 class AlertsManager:
     def __init__(self, db: Database):
         self.db = db
+        self._limiter = AsyncLimiter(max_rate=SEARCH_RATE_LIMIT, time_period=SEARCH_RATE_PERIOD_SECONDS)
+        self._cycle_lock = asyncio.Lock()
 
-    async def load_alerts(self):
-        pass
-
-    async def add_alert(self, user_id: int, query: str, max_price: Optional[float] = None) -> bool:
-        return await self.db.add_alert(user_id, query, max_price)
-
-    async def remove_alert(self, user_id: int, query: str) -> bool:
-        return await self.db.remove_alert(user_id, query)
+    async def check_alerts(self, scraper) -> List[Dict[str, Any]]:
+        """Run one alert cycle; returns no notifications if a previous cycle is still running."""
+        if self._cycle_lock.locked():
+            logger.warning("Previous alert check still running, skipping this cycle")
+            return []
 
-    async def get_alerts(self, user_id: int) -> List[Dict[str, Any]]:
-        return await self.db.get_user_alerts(user_id)
+        async with self._cycle_lock:
+            return await self._run_check(scraper)
 
-    async def check_alerts(self, scraper) -> List[Dict[str, Any]]:
+    async def _run_check(self, scraper) -> List[Dict[str, Any]]:
         from utils.deal_filter import DealFilter
-        
-        notifications = []
-        batch_seen = []
-        seen_in_cycle = set()
 
-        unique_queries = await self.db.get_all_unique_queries()
-        logger.info(f"Checking {len(unique_queries)} unique queries...")
+        subs_by_query = await self.db.get_alerts_grouped_by_query()
+        logger.info(f"Checking {len(subs_by_query)} unique queries...")
 
-        for query in unique_queries:
-            result = await scraper.search_deals(query, limit=5, sort="new")
+        sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
 
-            if not result["success"]:
-                continue
+        async def _process_query(
+            query: str, subscribers: List[Dict[str, Any]]
+        ) -> Tuple[List[Dict[str, Any]], List[tuple], int]:
+            notifications = []
+            batch_seen = []
+            seen_in_cycle = set()
 
-            subscribers = await self.db.get_alerts_by_query(query)
+            async with sem:
+                async with self._limiter:
+                    result = await scraper.search_deals(query, limit=5, sort="new")
 
-            if not subscribers:
-                continue
+            if not result["success"]:
+                return notifications, batch_seen, 0
 
             all_deals = result["deals"]
             filtered_deals = DealFilter.filter_deals(
@@ -53,6 +60,11 @@ class AlertsManager:
                 check_price=True
             )
 
+            candidate_pairs = {
+                (sub["id"], deal["link"]) for sub in subscribers for deal in filtered_deals
+            }
+            already_seen = await self.db.get_seen_pairs(candidate_pairs)
+
             for deal in filtered_deals:
                 deal_id = deal["link"]
 
@@ -65,7 +77,7 @@ class AlertsManager:
                     if cache_key in seen_in_cycle:
                         continue
 
-                    if await self.db.is_deal_seen_by_alert(alert_id, deal_id):
+                    if cache_key in already_seen:
                         seen_in_cycle.add(cache_key)
                         continue
 
@@ -82,12 +94,24 @@ class AlertsManager:
                     batch_seen.append(cache_key)
                     seen_in_cycle.add(cache_key)
 
-            if len(unique_queries) > 5:
-                await asyncio.sleep(1.5)
+            return notifications, batch_seen, len(seen_in_cycle)
+
+        results = await asyncio.gather(
+            *[_process_query(query, subs) for query, subs in subs_by_query.items()]
+        )
+
+        notifications = []
+        batch_seen = []
+        cached_checks = 0
+        for query_notifications, query_seen, query_checks in results:
+            notifications.extend(query_notifications)
+            batch_seen.extend(query_seen)
+            cached_checks += query_checks
 
+        # One write for the whole cycle, no matter how many queries ran in parallel
         if batch_seen:
             await self.db.mark_deals_seen_batch(batch_seen)
             logger.info(f"Batch marked {len(batch_seen)} deals as seen")
 
-        logger.info(f"Alert check complete: {len(notifications)} notifications, {len(seen_in_cycle)} cached checks")
-        return notifications
\ No newline at end of file
+        logger.info(f"Alert check complete: {len(notifications)} notifications, {cached_checks} cached checks")
+        return notifications
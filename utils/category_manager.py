@@ -1,26 +1,79 @@
+import asyncio
 import datetime
+import heapq
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Final, List, Mapping, Optional, Tuple
 
 import discord
 
-from .config import Config
 from .db import Database
+from .models import DAY_INDEX, Category
 from .scraper import PepperScraper
 
 logger = logging.getLogger("PepperBot.CategoryManager")
 
+_SLUG_RE = re.compile(r'[a-z0-9-]+')
+_TIME_RE = re.compile(r'^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$')
+_VALID_FREQUENCIES = ('daily', 'weekly', 'biweekly', 'monthly')
+_VALID_FREQUENCY_SET = frozenset(_VALID_FREQUENCIES)
+_VALID_DAYS = frozenset(DAY_INDEX)
+
+_SCHEDULE_FORMATTERS: Final[Mapping[str, Callable[[Category], str]]] = MappingProxyType({
+    'daily': lambda c: f"Daily at {c.schedule_time}",
+    'weekly': lambda c: f"Weekly ({c.schedule_day_display}) at {c.schedule_time}",
+    'biweekly': lambda c: f"Biweekly ({c.schedule_day_display}) at {c.schedule_time}",
+    'monthly': lambda c: f"Monthly (day {c.schedule_date}) at {c.schedule_time}",
+})
+
+_CATEGORY_EMOJI: Final[Mapping[str, str]] = MappingProxyType({
+    'bilety-lotnicze': '✈️',
+    'podzespoly-komputerowe': '💻',
+    'smartfony': '📱',
+    'gry': '🎮',
+    'lego': '🧱',
+    'laptopy': '💻',
+    'dom-i-ogrod': '🏡',
+    'narzedzia': '🔧',
+    'elektronika': '⚡',
+    'konsole': '🎮',
+    'moda-i-akcesoria': '👔',
+    'zabawki': '🧸',
+    'sport-i-wypoczynek': '⚽',
+    'ksiazki': '📚',
+    'zdrowie-i-uroda': '💄',
+    'jedzenie-i-napoje': '🍕',
+    'dom-i-meble': '🛋️',
+    'tv-audio-foto': '📺',
+    'auto-moto': '🚗',
+})
+
+# Categories due within this many seconds in the past are still fired (same window as should_run_now)
+SCHEDULE_GRACE_SECONDS = 120
+# Upper bound on a single scheduler sleep so clock changes are picked up eventually
+MAX_SCHEDULER_SLEEP_SECONDS = 3600
+# Longest gap between two runs (monthly on the 31st) is under this many days
+_MAX_LOOKAHEAD_DAYS = 62
+
 
 class CategoryManager:
+    __slots__ = ('db', '_heap', '_scheduled', '_last_run', '_schedule_dirty', '_schedule_changed')
+
     def __init__(self, db: Database):
         self.db = db
+        self._heap: List[Tuple[datetime.datetime, int]] = []
+        self._scheduled: Dict[int, Category] = {}
+        # Scheduler's own last-run times; Category objects are shared with the DB cache
+        self._last_run: Dict[int, float] = {}
+        self._schedule_dirty = True
+        self._schedule_changed = asyncio.Event()
 
     async def validate_slug(self, scraper: PepperScraper, slug: str) -> tuple[bool, Optional[str]]:
         """Validate category slug format and existence on Pepper.pl."""
         
         # IMPROVED: Validate slug format first (security)
-        if not re.match(r'^[a-z0-9-]+$', slug):
+        if not _SLUG_RE.fullmatch(slug):
             return False, "Invalid slug format. Use only lowercase letters, numbers, and hyphens."
         
         if len(slug) > 50:
@@ -48,8 +101,7 @@ class CategoryManager:
     ) -> tuple[bool, Optional[Dict], Optional[str]]:
         """Parse and validate schedule configuration."""
         
-        time_pattern = re.compile(r'^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$')
-        if not time_pattern.match(time):
+        if not _TIME_RE.match(time):
             return False, None, "Time must be in HH:MM format (e.g., 09:00)"
         
         schedule = {
@@ -59,11 +111,10 @@ class CategoryManager:
             'date': date
         }
         
-        valid_frequencies = ['daily', 'weekly', 'biweekly', 'monthly']
-        if schedule['type'] not in valid_frequencies:
-            return False, None, f"Frequency must be one of: {', '.join(valid_frequencies)}"
+        if schedule['type'] not in _VALID_FREQUENCY_SET:
+            return False, None, f"Frequency must be one of: {', '.join(_VALID_FREQUENCIES)}"
         
-        if schedule['type'] in ['weekly', 'biweekly'] and not day:
+        if schedule['type'] in ('weekly', 'biweekly') and not day:
             return False, None, f"{frequency} requires a day (e.g., monday)"
         
         if schedule['type'] == 'monthly' and not date:
@@ -72,28 +123,24 @@ class CategoryManager:
         if schedule['type'] == 'monthly' and (date < 1 or date > 31):
             return False, None, "Monthly date must be between 1-31"
         
-        valid_days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        if day and day.lower() not in valid_days:
-            return False, None, f"Day must be one of: {', '.join(valid_days)}"
+        if day and day.lower() not in _VALID_DAYS:
+            return False, None, f"Day must be one of: {', '.join(DAY_INDEX)}"
         
         return True, schedule, None
 
-    def should_run_now(self, category: Dict[str, Any]) -> bool:
+    def should_run_now(self, category: Category, last_run_ts: Optional[float] = None) -> bool:
         """
         IMPROVED: Check if category should run now with better time matching.
         Uses a time window approach to avoid missing scheduled runs.
         """
         now = datetime.datetime.now()
-        
-        # Parse scheduled time
-        schedule_time_parts = category['schedule_time'].split(':')
-        schedule_hour = int(schedule_time_parts[0])
-        schedule_minute = int(schedule_time_parts[1])
+        if last_run_ts is None:
+            last_run_ts = category.last_run_ts
         
         # Build the scheduled datetime for today
         scheduled_today = now.replace(
-            hour=schedule_hour, 
-            minute=schedule_minute, 
+            hour=category.schedule_hour, 
+            minute=category.schedule_minute, 
             second=0, 
             microsecond=0
         )
@@ -107,82 +154,153 @@ class CategoryManager:
             return False
         
         # IMPROVED: Check if already ran recently (prevents duplicate runs)
-        if category.get('last_run'):
-            try:
-                last_run = datetime.datetime.fromisoformat(category['last_run'])
-                minutes_since_last_run = (now - last_run).total_seconds() / 60
-                
-                # If ran within last 30 minutes, skip
-                if minutes_since_last_run < 30:
-                    return False
-            except (ValueError, TypeError):
-                # Invalid last_run timestamp, continue with check
-                pass
+        seconds_since_last_run = now.timestamp() - last_run_ts
+        
+        # If ran within last 30 minutes, skip
+        if seconds_since_last_run < 1800:
+            return False
         
         # Apply frequency-specific logic
-        if category['schedule_type'] == 'daily':
+        schedule_type = category.schedule_type
+        if schedule_type == 'daily':
             return True
         
-        if category['schedule_type'] in ['weekly', 'biweekly']:
-            day_map = {
-                'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-                'friday': 4, 'saturday': 5, 'sunday': 6
-            }
-            target_day = day_map.get(category['schedule_day'])
-            if target_day is None or now.weekday() != target_day:
+        if schedule_type == 'weekly' or schedule_type == 'biweekly':
+            if now.weekday() != category.schedule_day_idx:
                 return False
             
             # For biweekly, check if 14 days passed since last run
-            if category['schedule_type'] == 'biweekly':
-                if category.get('last_run'):
-                    try:
-                        last_run = datetime.datetime.fromisoformat(category['last_run'])
-                        days_since = (now - last_run).days
-                        if days_since < 13:  # Less than 2 weeks
-                            return False
-                    except (ValueError, TypeError):
-                        pass
+            if schedule_type == 'biweekly':
+                days_since = seconds_since_last_run / 86400
+                if days_since < 13:  # Less than 2 weeks
+                    return False
             
             return True
         
-        if category['schedule_type'] == 'monthly':
-            return now.day == category['schedule_date']
+        if schedule_type == 'monthly':
+            return now.day == category.schedule_date
         
         return False
 
-    def format_schedule(self, category: Dict[str, Any]) -> str:
+    def compute_next_run(
+        self, category: Category, after: datetime.datetime, last_run_ts: Optional[float] = None
+    ) -> Optional[datetime.datetime]:
+        """Return the first scheduled slot strictly after ``after``, or None if it never runs."""
+        schedule_type = category.schedule_type
+        target_day = category.schedule_day_idx
+        if last_run_ts is None:
+            last_run_ts = category.last_run_ts
+
+        candidate = after.replace(
+            hour=category.schedule_hour,
+            minute=category.schedule_minute,
+            second=0,
+            microsecond=0,
+        )
+        if candidate <= after:
+            candidate += datetime.timedelta(days=1)
+
+        for _ in range(_MAX_LOOKAHEAD_DAYS):
+            # Mirrors should_run_now: skip slots within 30 minutes of the last run
+            since_last_run = candidate.timestamp() - last_run_ts
+            recently_ran = since_last_run < 1800
+
+            if recently_ran:
+                pass
+            elif schedule_type == 'daily':
+                return candidate
+            elif schedule_type in ('weekly', 'biweekly'):
+                if target_day < 0:
+                    return None
+                if candidate.weekday() == target_day:
+                    if schedule_type == 'weekly' or since_last_run / 86400 >= 13:
+                        return candidate
+            elif schedule_type == 'monthly':
+                if candidate.day == category.schedule_date:
+                    return candidate
+            else:
+                return None
+
+            candidate += datetime.timedelta(days=1)
+
+        return None
+
+    def invalidate_schedule(self):
+        """Force the scheduler to reload categories after a config change."""
+        self._schedule_dirty = True
+        self._schedule_changed.set()
+
+    async def _rebuild_schedule(self, now: datetime.datetime):
+        # Cleared before the read, so an invalidation that lands while it is in flight
+        # leaves the schedule dirty and forces another rebuild
+        self._schedule_dirty = False
+        try:
+            categories = await self.db.get_active_categories_for_schedule()
+        except BaseException:
+            self._schedule_dirty = True
+            raise
+        after = now - datetime.timedelta(seconds=SCHEDULE_GRACE_SECONDS)
+
+        self._scheduled = {category.id: category for category in categories}
+        # Runs that sent nothing never update last_run in the DB, so keep the later time
+        self._last_run = {
+            category.id: max(category.last_run_ts, self._last_run.get(category.id, 0.0))
+            for category in categories
+        }
+        self._heap = []
+        for category in categories:
+            next_run = self.compute_next_run(category, after, self._last_run[category.id])
+            if next_run is not None:
+                self._heap.append((next_run, category.id))
+        heapq.heapify(self._heap)
+
+        logger.info(f"Scheduled {len(self._heap)} active categories")
+
+    async def wait_for_due_categories(self) -> List[Category]:
+        """Sleep until the earliest category is due, then return every due category.
+
+        Popped categories are pushed back with their following slot, so each
+        category costs O(log N) per run instead of a check every minute.
+        """
+        while True:
+            self._schedule_changed.clear()
+            if self._schedule_dirty:
+                await self._rebuild_schedule(datetime.datetime.now())
+
+            now = datetime.datetime.now()
+            if self._heap and self._heap[0][0] <= now:
+                break
+
+            delay = MAX_SCHEDULER_SLEEP_SECONDS
+            if self._heap:
+                delay = min(delay, (self._heap[0][0] - now).total_seconds())
+
+            try:
+                await asyncio.wait_for(self._schedule_changed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            slot, category_id = heapq.heappop(self._heap)
+            category = self._scheduled[category_id]
+            last_run_ts = self._last_run[category_id]
+
+            if self.should_run_now(category, last_run_ts):
+                due.append(category)
+                last_run_ts = self._last_run[category_id] = now.timestamp()
+
+            next_run = self.compute_next_run(category, slot, last_run_ts)
+            if next_run is not None:
+                heapq.heappush(self._heap, (next_run, category_id))
+
+        return due
+
+    def format_schedule(self, category: Category) -> str:
         """Format schedule configuration for display."""
-        if category['schedule_type'] == 'daily':
-            return f"Daily at {category['schedule_time']}"
-        elif category['schedule_type'] == 'weekly':
-            return f"Weekly ({category['schedule_day'].capitalize()}) at {category['schedule_time']}"
-        elif category['schedule_type'] == 'biweekly':
-            return f"Biweekly ({category['schedule_day'].capitalize()}) at {category['schedule_time']}"
-        elif category['schedule_type'] == 'monthly':
-            return f"Monthly (day {category['schedule_date']}) at {category['schedule_time']}"
-        return "Unknown schedule"
+        formatter = _SCHEDULE_FORMATTERS.get(category.schedule_type)
+        return formatter(category) if formatter else "Unknown schedule"
 
     def get_category_emoji(self, slug: str) -> str:
         """Get emoji for category based on slug."""
-        emoji_map = {
-            'bilety-lotnicze': '✈️',
-            'podzespoly-komputerowe': '💻',
-            'smartfony': '📱',
-            'gry': '🎮',
-            'lego': '🧱',
-            'laptopy': '💻',
-            'dom-i-ogrod': '🏡',
-            'narzedzia': '🔧',
-            'elektronika': '⚡',
-            'konsole': '🎮',
-            'moda-i-akcesoria': '👔',
-            'zabawki': '🧸',
-            'sport-i-wypoczynek': '⚽',
-            'ksiazki': '📚',
-            'zdrowie-i-uroda': '💄',
-            'jedzenie-i-napoje': '🍕',
-            'dom-i-meble': '🛋️',
-            'tv-audio-foto': '📺',
-            'auto-moto': '🚗',
-        }
-        return emoji_map.get(slug, '📂')
\ No newline at end of file
+        return _CATEGORY_EMOJI.get(slug, '📂')
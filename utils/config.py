@@ -1,30 +1,58 @@
+from typing import Final
+
+# Colors
+COLOR_PRIMARY: Final[int] = 0xFF6B35  # Pepper Orange
+COLOR_SUCCESS: Final[int] = 0x00FF00  # Green
+COLOR_ERROR: Final[int] = 0xFF0000  # Red
+COLOR_WARNING: Final[int] = 0xFFA500  # Orange
+COLOR_NEUTRAL: Final[int] = 0x808080  # Grey
+
+# Limits
+DEFAULT_SEARCH_LIMIT: Final[int] = 7
+MAX_CLEAN_LIMIT: Final[int] = 100
+
+# Timeouts
+REQUEST_TIMEOUT: Final[int] = 15
+
+# Scraper
+USER_AGENT: Final[str] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+FLIGHT_CATEGORY_URL: Final[str] = "https://www.pepper.pl/grupa/bilety-lotnicze"
+GROUP_URL_TEMPLATE: Final[str] = "https://www.pepper.pl/grupa/{}"
+
+# Discord
+FLIGHT_CHANNEL_ID: Final[int] = 1448267942826475574
+FLIGHT_SCHEDULE_HOUR: Final[int] = 8  # 8:00 AM
+
+# Storage
+SENT_DEALS_FILE: Final[str] = "sent_flights.json"
+ALERTS_FILE: Final[str] = "alerts.json"
+
+# Watcher
+WATCH_INTERVAL_MINUTES: Final[int] = 15
+
+
 class Config:
-    # Colors
-    COLOR_PRIMARY = 0xFF6B35  # Pepper Orange
-    COLOR_SUCCESS = 0x00FF00  # Green
-    COLOR_ERROR = 0xFF0000  # Red
-    COLOR_WARNING = 0xFFA500  # Orange
-    COLOR_NEUTRAL = 0x808080  # Grey
-
-    # Limits
-    DEFAULT_SEARCH_LIMIT = 7
-    MAX_CLEAN_LIMIT = 100
-
-    # Timeouts
-    REQUEST_TIMEOUT = 15
-
-    # Scraper
-    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    FLIGHT_CATEGORY_URL = "https://www.pepper.pl/grupa/bilety-lotnicze"
-    GROUP_URL_TEMPLATE = "https://www.pepper.pl/grupa/{}"
-
-    # Discord
-    FLIGHT_CHANNEL_ID = 1448267942826475574
-    FLIGHT_SCHEDULE_HOUR = 8  # 8:00 AM
-
-    # Storage
-    SENT_DEALS_FILE = "sent_flights.json"
-    ALERTS_FILE = "alerts.json"
-
-    # Watcher
-    WATCH_INTERVAL_MINUTES = 15
+    """Backward-compatible namespace; prefer importing the module-level constants."""
+
+    COLOR_PRIMARY = COLOR_PRIMARY
+    COLOR_SUCCESS = COLOR_SUCCESS
+    COLOR_ERROR = COLOR_ERROR
+    COLOR_WARNING = COLOR_WARNING
+    COLOR_NEUTRAL = COLOR_NEUTRAL
+
+    DEFAULT_SEARCH_LIMIT = DEFAULT_SEARCH_LIMIT
+    MAX_CLEAN_LIMIT = MAX_CLEAN_LIMIT
+
+    REQUEST_TIMEOUT = REQUEST_TIMEOUT
+
+    USER_AGENT = USER_AGENT
+    FLIGHT_CATEGORY_URL = FLIGHT_CATEGORY_URL
+    GROUP_URL_TEMPLATE = GROUP_URL_TEMPLATE
+
+    FLIGHT_CHANNEL_ID = FLIGHT_CHANNEL_ID
+    FLIGHT_SCHEDULE_HOUR = FLIGHT_SCHEDULE_HOUR
+
+    SENT_DEALS_FILE = SENT_DEALS_FILE
+    ALERTS_FILE = ALERTS_FILE
+
+    WATCH_INTERVAL_MINUTES = WATCH_INTERVAL_MINUTES
@@ -1,231 +1,597 @@
+import asyncio
+import contextlib
+import copy
+import itertools
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
 
 import aiosqlite
 
+from .models import CATEGORY_COLUMNS, Category
+
 logger = logging.getLogger("PepperBot.Database")
 
+# Keeps (alert_id, deal_id) row-value lookups under SQLite's 999 bound-parameter limit.
+SEEN_PAIRS_CHUNK_SIZE = 400
+# Same limit for single-column IN (...) lookups, leaving room for one extra parameter.
+IN_CLAUSE_CHUNK_SIZE = 900
+
+# Applied once to the shared connection: WAL lets reads proceed alongside writes,
+# NORMAL sync is durable in WAL mode, and a 64 MB page cache keeps hot indexes in memory.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+# sent_deals and alert_history are WITHOUT ROWID: rows live in the primary-key B-tree itself,
+# so the existence checks that dominate the workload are one probe with no rowid indirection.
+_SENT_DEALS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    deal_id TEXT PRIMARY KEY,
+    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) WITHOUT ROWID
+"""
+
+_ALERT_HISTORY_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    alert_id INTEGER NOT NULL,
+    deal_id TEXT NOT NULL,
+    seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(alert_id) REFERENCES alerts(id) ON DELETE CASCADE,
+    PRIMARY KEY(alert_id, deal_id)
+) WITHOUT ROWID
+"""
+
+# Same clustered layout for category_sent_deals, which migration_001 creates as a rowid table.
+_CATEGORY_SENT_DEALS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    category_id INTEGER NOT NULL,
+    deal_id TEXT NOT NULL,
+    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(category_id) REFERENCES category_configs(id) ON DELETE CASCADE,
+    PRIMARY KEY(category_id, deal_id)
+) WITHOUT ROWID
+"""
+
+# Core schema, sent as one script so it is parsed once and committed in a single transaction.
+_SCHEMA_SQL = f"""
+BEGIN;
+
+{_SENT_DEALS_TABLE.format(name="sent_deals").strip()};
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    max_price REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(user_id, query)
+);
+
+{_ALERT_HISTORY_TABLE.format(name="alert_history").strip()};
+
+CREATE INDEX IF NOT EXISTS idx_alerts_user_id ON alerts(user_id);
+CREATE INDEX IF NOT EXISTS idx_alerts_query ON alerts(query);
+CREATE INDEX IF NOT EXISTS idx_sent_deals_sent_at ON sent_deals(sent_at);
+
+COMMIT;
+"""
+
+# Rowid tables from older databases rebuilt as WITHOUT ROWID at startup:
+# (table, create template, columns, primary key, indexes made redundant by the clustered key)
+_WITHOUT_ROWID_TABLES = (
+    (
+        "sent_deals", _SENT_DEALS_TABLE,
+        ("deal_id", "sent_at"), ("deal_id",),
+        ("idx_sent_deals_deal_id",),
+    ),
+    (
+        "alert_history", _ALERT_HISTORY_TABLE,
+        ("alert_id", "deal_id", "seen_at"), ("alert_id", "deal_id"),
+        ("idx_alert_history_alert_id", "idx_alert_history_lookup"),
+    ),
+    (
+        "category_sent_deals", _CATEGORY_SENT_DEALS_TABLE,
+        ("category_id", "deal_id", "sent_at"), ("category_id", "deal_id"),
+        ("idx_category_sent_lookup",),
+    ),
+)
+
+# Column names come only from the CATEGORY_COLUMNS constant
+_CATEGORY_SELECT = f"SELECT {', '.join(CATEGORY_COLUMNS)} FROM category_configs"  # noqa: S608
+
+
+def _category_row_factory(cursor, row) -> Category:
+    """Cursor row factory that turns plain category_configs tuples straight into Category."""
+    return Category.from_tuple(row)
+
+
+# Hot statements kept as module constants so every call passes the identical SQL text
+# and hits sqlite3's per-connection prepared-statement cache instead of re-preparing.
+_SQL_INSERT_SENT_DEAL = "INSERT OR IGNORE INTO sent_deals (deal_id) VALUES (?)"
+_SQL_INSERT_SEEN = "INSERT OR IGNORE INTO alert_history (alert_id, deal_id) VALUES (?, ?)"
+_SQL_INSERT_CATEGORY_DEAL = "INSERT OR IGNORE INTO category_sent_deals (category_id, deal_id) VALUES (?, ?)"
+# Room for the hot statements plus the chunked IN (...) variants of each size
+STATEMENT_CACHE_SIZE = 256
+
+# WAL allows concurrent readers, so SELECTs get their own small pool of connections
+READER_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Rows pulled per worker-thread hop when streaming a cursor (aiosqlite defaults to 1)
+FETCH_CHUNK_SIZE = 256
+
+# Sent/seen flags only ever flip to True (until cleanup), so positive hits are cached in-process
+SEEN_CACHE_SIZE = 50_000
+
+# Single-row writers that have already logged their deprecation warning
+_warned_single_row_writers: Set[str] = set()
+
+
+def _warn_single_row_writer(name: str):
+    if name in _warned_single_row_writers:
+        return
+    _warned_single_row_writers.add(name)
+    logger.warning(
+        f"Database.{name} is deprecated; use the *_batch methods or Database.transaction()"
+    )
+
+
+class _WriteTransaction:
+    """Sent/seen writes issued inside ``Database.transaction()``; committed together on exit."""
+
+    __slots__ = ('_db', 'sent', 'seen', 'category_sent')
+
+    def __init__(self, db: aiosqlite.Connection):
+        self._db = db
+        self.sent: List[str] = []
+        self.seen: List[Tuple[int, str]] = []
+        self.category_sent: List[Tuple[int, str]] = []
+
+    async def mark_sent(self, deal_id: str):
+        await self._db.execute(_SQL_INSERT_SENT_DEAL, (deal_id,))
+        self.sent.append(deal_id)
+
+    async def mark_seen(self, alert_id: int, deal_id: str):
+        await self._db.execute(_SQL_INSERT_SEEN, (alert_id, deal_id))
+        self.seen.append((alert_id, deal_id))
+
+    async def mark_category_sent(self, category_id: int, deal_id: str):
+        await self._db.execute(_SQL_INSERT_CATEGORY_DEAL, (category_id, deal_id))
+        self.category_sent.append((category_id, deal_id))
+
+
+class _LRUSet:
+    """Bounded set that evicts the least recently used key once full."""
+
+    __slots__ = ('_items', '_maxsize')
+
+    def __init__(self, maxsize: int):
+        self._items: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._maxsize = maxsize
+
+    def __contains__(self, key: Hashable) -> bool:
+        if key in self._items:
+            self._items.move_to_end(key)
+            return True
+        return False
+
+    def add(self, key: Hashable):
+        self._items[key] = None
+        self._items.move_to_end(key)
+        if len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def update(self, keys: Iterable[Hashable]):
+        for key in keys:
+            self.add(key)
+
+    def clear(self):
+        self._items.clear()
+
 
 class Database:
+    # Migration script text, read once per process and shared by every instance
+    _migration_sql: Optional[str] = None
+
     def __init__(self, db_name="pepperbot.db"):
         self.db_name = db_name
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._reader_queue: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._sent_cache = _LRUSet(SEEN_CACHE_SIZE)
+        self._seen_cache = _LRUSet(SEEN_CACHE_SIZE)
+        self._category_sent_cache = _LRUSet(SEEN_CACHE_SIZE)
+        self._migrated = False
+        # Category list queries, cleared by every category_configs write; the generation
+        # stops a read that raced a write from caching its stale result
+        self._category_cache: Dict[tuple, List[Category]] = {}
+        self._category_generation = 0
+        # Task inside a transaction() block; its other writes would wait on the lock it holds
+        self._transaction_task: Optional[asyncio.Task] = None
 
     async def init(self):
-        """Initialize the database and create tables if they don't exist."""
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS sent_deals (
-                    deal_id TEXT PRIMARY KEY,
-                    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    query TEXT NOT NULL,
-                    max_price REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, query)
-                )
-            """)
-
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS alert_history (
-                    alert_id INTEGER,
-                    deal_id TEXT,
-                    seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY(alert_id) REFERENCES alerts(id) ON DELETE CASCADE,
-                    PRIMARY KEY(alert_id, deal_id)
-                )
-            """)
+        """Open the writer and reader connections and create tables if they don't exist."""
+        self._writer = await self._connect()
 
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_alerts_user_id ON alerts(user_id)"
-            )
-            
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_alerts_query ON alerts(query)"
-            )
-            
- 
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_alert_history_alert_id ON alert_history(alert_id)"
-            )
-            
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_alert_history_lookup 
-                ON alert_history(alert_id, deal_id)
-            """)
-            
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_sent_deals_deal_id ON sent_deals(deal_id)"
-            )
-            
-            await db.execute(
-                "CREATE INDEX IF NOT EXISTS idx_sent_deals_sent_at ON sent_deals(sent_at)"
+        async with self._write() as db:
+            await db.executescript(_SCHEMA_SQL)
+        logger.info("Database initialized with performance indexes.")
+
+        await self.run_migration()
+        await self.migrate_last_run_to_epoch()
+        for table, create_sql, columns, primary_key, redundant_indexes in _WITHOUT_ROWID_TABLES:
+            await self._convert_to_without_rowid(
+                table, create_sql, columns, primary_key, redundant_indexes
             )
 
-            await db.commit()
-            logger.info("Database initialized with performance indexes.")
+        # Give the planner real statistics for the multi-column category/alert indexes;
+        # analysis_limit keeps this cheap by sampling large indexes instead of scanning them.
+        async with self._write() as db:
+            await db.execute("PRAGMA analysis_limit=1000")
+            await db.execute("ANALYZE")
+
+        for _ in range(READER_POOL_SIZE):
+            reader = await self._connect("PRAGMA query_only=ON")
+            self._readers.append(reader)
+            self._reader_queue.put_nowait(reader)
+
+    async def _connect(self, *extra_pragmas: str) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_name, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = aiosqlite.Row
+        for pragma in (*_CONNECTION_PRAGMAS, *extra_pragmas):
+            await conn.execute(pragma)
+        return conn
+
+    @contextlib.asynccontextmanager
+    async def _reader(self):
+        """Borrow a read-only connection from the pool for the duration of the block."""
+        conn = await self._reader_queue.get()
+        try:
+            yield conn
+        finally:
+            self._reader_queue.put_nowait(conn)
 
-        await self.run_migration()
+    @contextlib.asynccontextmanager
+    async def _write(self):
+        """Hold the write lock for one transaction on the shared writer.
 
-    async def run_migration(self):
-        """Run category system migration with improved path handling."""
-        async with aiosqlite.connect(self.db_name) as db:
-            # Check if migration already applied
-            async with db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='category_configs'"
-            ) as cursor:
-                if await cursor.fetchone():
-                    logger.info("Category tables already exist, skipping migration")
-                    return
-            
+        Commits when the block exits cleanly and rolls back if it raises, so a failed
+        statement never leaves partial changes for the next writer's commit to pick up.
+        """
+        if self._transaction_task is not None and self._transaction_task is asyncio.current_task():
+            raise RuntimeError(
+                "Database writers cannot be called inside transaction(); use the yielded tx"
+            )
+        async with self._write_lock:
             try:
-                base_dir = os.path.dirname(os.path.dirname(__file__))
-                possible_paths = [
-                    os.path.join(base_dir, 'migrations', 'migration_001_category_system.sql'),
-                    os.path.join(base_dir, '..', 'migrations', 'migration_001_category_system.sql'),
-                    os.path.join(os.getcwd(), 'migrations', 'migration_001_category_system.sql'),
-                    'migrations/migration_001_category_system.sql',
-                    './migration_001_category_system.sql',
-                ]
-                
-                migration_path = None
-                for path in possible_paths:
-                    if os.path.exists(path):
-                        migration_path = path
-                        logger.info(f"Found migration file at: {path}")
-                        break
-                
-                if not migration_path:
-                    logger.error(f"Migration file not found! Searched paths: {possible_paths}")
-                    raise FileNotFoundError(
-                        "Migration file migration_001_category_system.sql not found. "
-                        "Please ensure it's in the migrations/ directory."
-                    )
-
-                with open(migration_path, 'r', encoding='utf-8') as f:
-                    migration_sql = f.read()
-                
-                await db.executescript(migration_sql)
-                logger.info("Successfully applied category system migration")
-                
-            except Exception as e:
-                logger.error(f"Migration failed: {e}", exc_info=True)
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
                 raise
 
+    async def run_migration(self):
+        """Run category system migration with improved path handling."""
+        if self._migrated:
+            return
+
+        db = self._writer
+        # Check if migration already applied, before touching the filesystem
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='category_configs' LIMIT 1"
+        ) as cursor:
+            if await cursor.fetchone():
+                logger.info("Category tables already exist, skipping migration")
+                self._migrated = True
+                return
+
+        try:
+            if Database._migration_sql is None:
+                Database._migration_sql = await asyncio.to_thread(self._read_migration_file)
+
+            async with self._write() as db:
+                await db.executescript(Database._migration_sql)
+            self._migrated = True
+            logger.info("Successfully applied category system migration")
+
+        except Exception as e:
+            logger.error(f"Migration failed: {e}", exc_info=True)
+            raise
+
+    @staticmethod
+    def _read_migration_file() -> str:
+        """Locate and read the category migration; blocking, so run it in a worker thread."""
+        base_dir = os.path.dirname(os.path.dirname(__file__))
+        possible_paths = [
+            os.path.join(base_dir, 'migrations', 'migration_001_category_system.sql'),
+            os.path.join(base_dir, '..', 'migrations', 'migration_001_category_system.sql'),
+            os.path.join(os.getcwd(), 'migrations', 'migration_001_category_system.sql'),
+            'migrations/migration_001_category_system.sql',
+            './migration_001_category_system.sql',
+        ]
+
+        migration_path = None
+        for path in possible_paths:
+            if os.path.exists(path):
+                migration_path = path
+                logger.info(f"Found migration file at: {path}")
+                break
+
+        if not migration_path:
+            logger.error(f"Migration file not found! Searched paths: {possible_paths}")
+            raise FileNotFoundError(
+                "Migration file migration_001_category_system.sql not found. "
+                "Please ensure it's in the migrations/ directory."
+            )
+
+        with open(migration_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    async def migrate_last_run_to_epoch(self):
+        """Convert legacy ISO text last_run values (UTC CURRENT_TIMESTAMP) to Unix timestamps."""
+        async with self._write() as db:
+            cursor = await db.execute(
+                """
+                UPDATE category_configs
+                SET last_run = CAST(strftime('%s', last_run) AS REAL)
+                WHERE typeof(last_run) = 'text'
+                """
+            )
+            converted = cursor.rowcount
+        if converted:
+            logger.info(f"Converted {converted} category last_run values to epoch timestamps")
+
+    async def _convert_to_without_rowid(
+        self,
+        table: str,
+        create_sql: str,
+        columns: Tuple[str, ...],
+        primary_key: Tuple[str, ...],
+        redundant_indexes: Tuple[str, ...] = (),
+    ):
+        """Rebuild a rowid table as WITHOUT ROWID, keeping its rows and secondary indexes.
+
+        Indexes that only duplicate the primary key are dropped, since the clustered
+        key already serves those lookups. No-op once the table has been converted.
+        """
+        async with self._writer.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None or "WITHOUT ROWID" in row[0].upper():
+            return
+
+        async with self._writer.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,),
+        ) as cursor:
+            index_sql = [
+                f"{index['sql']};" async for index in cursor
+                if index["name"] not in redundant_indexes
+            ]
+
+        column_list = ", ".join(columns)
+        # WITHOUT ROWID forbids NULL key columns, which a rowid table would have accepted
+        key_filter = " AND ".join(f"{column} IS NOT NULL" for column in primary_key)
+        new_table = f"{table}_new"
+        # Table and column names come only from the internal _WITHOUT_ROWID_TABLES spec
+        script = "\n".join([
+            "BEGIN;",
+            f"DROP TABLE IF EXISTS {new_table};",
+            create_sql.format(name=new_table).strip() + ";",
+            f"INSERT OR IGNORE INTO {new_table} ({column_list}) "  # noqa: S608
+            f"SELECT {column_list} FROM {table} WHERE {key_filter};",
+            f"DROP TABLE {table};",
+            f"ALTER TABLE {new_table} RENAME TO {table};",
+            *index_sql,
+            "COMMIT;",
+        ])
+
+        async with self._write() as db:
+            await db.executescript(script)
+        logger.info(f"Converted {table} to a WITHOUT ROWID table")
+
+    async def optimize(self):
+        """Refresh planner statistics for tables whose contents changed enough to matter."""
+        async with self._write() as db:
+            await db.execute("PRAGMA optimize")
+
     async def close(self):
-        """Placeholder if we need to close persistent connections later."""
-        pass
+        """Close the writer and every pooled reader."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        self._reader_queue = asyncio.Queue()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """Write sent/seen marks in one explicit transaction, committed when the block exits.
+
+        The writer is held for the whole block, and everything is rolled back if it raises.
+        Only use the yielded tx inside the block. Another Database writer called from the
+        same task raises RuntimeError instead of deadlocking on the lock this block holds.
+
+            async with db.transaction() as tx:
+                await tx.mark_sent(deal_id)
+                await tx.mark_category_sent(category_id, deal_id)
+        """
+        async with self._write() as db:
+            await db.execute("BEGIN")
+            tx = _WriteTransaction(db)
+            self._transaction_task = asyncio.current_task()
+            try:
+                yield tx
+            finally:
+                self._transaction_task = None
+        self._sent_cache.update(tx.sent)
+        self._seen_cache.update(tx.seen)
+        self._category_sent_cache.update(tx.category_sent)
 
     async def add_sent_deal(self, deal_id: str):
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute("INSERT OR IGNORE INTO sent_deals (deal_id) VALUES (?)", (deal_id,))
-            await db.commit()
-
-    async def is_deal_sent(self, deal_id: str) -> bool:
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                "SELECT 1 FROM sent_deals WHERE deal_id = ?", (deal_id,)
+        """Deprecated: use mark_deals_sent_batch or transaction()."""
+        _warn_single_row_writer("add_sent_deal")
+        async with self._write() as db:
+            await db.execute(_SQL_INSERT_SENT_DEAL, (deal_id,))
+        self._sent_cache.add(deal_id)
+
+    async def get_sent_deal_ids(self, deal_ids: Iterable[str]) -> Set[str]:
+        """Returns the subset of deal_ids already recorded in sent_deals."""
+        sent = set()
+        misses = []
+        for deal_id in deal_ids:
+            if deal_id in self._sent_cache:
+                sent.add(deal_id)
+            else:
+                misses.append(deal_id)
+
+        for i in range(0, len(misses), IN_CLAUSE_CHUNK_SIZE):
+            chunk = misses[i:i + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            # Only "?" markers are interpolated; the deal ids stay bound parameters.
+            async with self._reader() as db, db.execute(
+                f"SELECT deal_id FROM sent_deals WHERE deal_id IN ({placeholders})", chunk  # noqa: S608
             ) as cursor:
-                return await cursor.fetchone() is not None
+                cursor.arraysize = FETCH_CHUNK_SIZE
+                async for row in cursor:
+                    sent.add(row[0])
+                    self._sent_cache.add(row[0])
+        return sent
+
+    async def mark_deals_sent_batch(self, deal_ids: List[str]):
+        if not deal_ids:
+            return
+        async with self._write() as db:
+            await db.executemany(
+                _SQL_INSERT_SENT_DEAL,
+                [(deal_id,) for deal_id in deal_ids],
+            )
+        self._sent_cache.update(deal_ids)
 
     async def cleanup_old_deals(self, days=30):
         """Clean up old sent deals to prevent database bloat."""
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 "DELETE FROM sent_deals WHERE sent_at < datetime('now', ?)", (f"-{days} days",)
             )
             deleted = cursor.rowcount
-            await db.commit()
-            logger.info(f"Cleaned up {deleted} old sent deals (older than {days} days)")
-            return deleted
+        self._sent_cache.clear()
+        logger.info(f"Cleaned up {deleted} old sent deals (older than {days} days)")
+        return deleted
 
     async def add_alert(self, user_id: int, query: str, max_price: Optional[float] = None) -> bool:
         """Adds or updates an alert."""
         try:
-            async with aiosqlite.connect(self.db_name) as db:
+            async with self._write() as db:
                 await db.execute(
                     """
-                    INSERT INTO alerts (user_id, query, max_price) 
+                    INSERT INTO alerts (user_id, query, max_price)
                     VALUES (?, ?, ?)
                     ON CONFLICT(user_id, query) DO UPDATE SET
                     max_price = excluded.max_price
                 """,
                     (user_id, query, max_price),
                 )
-                await db.commit()
             return True
         except Exception as e:
             logger.error(f"Error adding alert: {e}")
             return False
 
     async def remove_alert(self, user_id: int, query: str) -> bool:
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 "DELETE FROM alerts WHERE user_id = ? AND query = ?", (user_id, query)
             )
-            await db.commit()
-            return cursor.rowcount > 0
+        return cursor.rowcount > 0
 
     async def get_user_alerts(self, user_id: int) -> List[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM alerts WHERE user_id = ?", (user_id,)) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-
-    async def get_all_unique_queries(self) -> List[str]:
-        """Returns a list of unique queries to search for."""
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute("SELECT DISTINCT query FROM alerts") as cursor:
-                rows = await cursor.fetchall()
-                return [row[0] for row in rows]
+        async with self._reader() as db, db.execute("SELECT * FROM alerts WHERE user_id = ?", (user_id,)) as cursor:
+            cursor.arraysize = FETCH_CHUNK_SIZE
+            return [dict(row) async for row in cursor]
 
     async def get_alerts_by_query(self, query: str) -> List[Dict[str, Any]]:
         """Returns all alerts watching a specific query."""
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM alerts WHERE query = ?", (query,)) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-
-    async def is_deal_seen_by_alert(self, alert_id: int, deal_id: str) -> bool:
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                "SELECT 1 FROM alert_history WHERE alert_id = ? AND deal_id = ?",
-                (alert_id, deal_id),
+        async with self._reader() as db, db.execute("SELECT * FROM alerts WHERE query = ?", (query,)) as cursor:
+            cursor.arraysize = FETCH_CHUNK_SIZE
+            return [dict(row) async for row in cursor]
+
+    async def get_alerts_grouped_by_query(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Returns every alert grouped by query, fetched with a single SELECT."""
+        async with self._reader() as db, db.execute(
+            "SELECT id, user_id, query, max_price FROM alerts ORDER BY query"
+        ) as cursor:
+            cursor.arraysize = FETCH_CHUNK_SIZE
+            rows = [dict(row) async for row in cursor]
+        return {
+            query: list(alerts)
+            for query, alerts in itertools.groupby(rows, key=lambda alert: alert["query"])
+        }
+
+    async def get_seen_pairs(self, pairs: Iterable[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+        """Returns the subset of (alert_id, deal_id) pairs already in alert history."""
+        seen = set()
+        misses = []
+        for pair in pairs:
+            if pair in self._seen_cache:
+                seen.add(pair)
+            else:
+                misses.append(pair)
+
+        for i in range(0, len(misses), SEEN_PAIRS_CHUNK_SIZE):
+            chunk = misses[i:i + SEEN_PAIRS_CHUNK_SIZE]
+            values = ",".join("(?, ?)" for _ in chunk)
+            params = [value for pair in chunk for value in pair]
+            # Joining against a VALUES list lets SQLite probe the (alert_id, deal_id)
+            # primary key per pair; a row-value IN (VALUES ...) falls back to a scan.
+            # Only "(?, ?)" markers are interpolated; every pair value stays bound.
+            async with self._reader() as db, db.execute(
+                f"SELECT h.alert_id, h.deal_id FROM (VALUES {values}) AS v "  # noqa: S608
+                f"JOIN alert_history h ON h.alert_id = v.column1 AND h.deal_id = v.column2",
+                params,
             ) as cursor:
-                return await cursor.fetchone() is not None
+                cursor.arraysize = FETCH_CHUNK_SIZE
+                async for row in cursor:
+                    pair = (row[0], row[1])
+                    seen.add(pair)
+                    self._seen_cache.add(pair)
+        return seen
 
     async def mark_deal_seen(self, alert_id: int, deal_id: str):
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                "INSERT OR IGNORE INTO alert_history (alert_id, deal_id) VALUES (?, ?)",
-                (alert_id, deal_id),
-            )
-            await db.commit()
+        """Deprecated: use mark_deals_seen_batch or transaction()."""
+        _warn_single_row_writer("mark_deal_seen")
+        async with self._write() as db:
+            await db.execute(_SQL_INSERT_SEEN, (alert_id, deal_id))
+        self._seen_cache.add((alert_id, deal_id))
 
     async def mark_deals_seen_batch(self, records: List[tuple]):
-        """Batch insert for alert history.
-        
+        """Batch insert for alert history in a single transaction.
+
+        Pairs that are already recorded are skipped, so overlapping batches are safe.
+
         Args:
             records: List of (alert_id, deal_id) tuples
         """
         if not records:
             return
-        
-        async with aiosqlite.connect(self.db_name) as db:
+
+        async with self._write() as db:
             await db.executemany(
-                "INSERT OR IGNORE INTO alert_history (alert_id, deal_id) VALUES (?, ?)",
-                records
+                """
+                INSERT INTO alert_history (alert_id, deal_id) VALUES (?, ?)
+                ON CONFLICT(alert_id, deal_id) DO NOTHING
+                """,
+                records,
             )
-            await db.commit()
-        
+        self._seen_cache.update(records)
+
         logger.debug(f"Batch marked {len(records)} deals as seen")
 
     async def add_category_config(
@@ -242,19 +608,19 @@ class Database:
         max_price: float = None,
     ) -> Optional[int]:
         try:
-            async with aiosqlite.connect(self.db_name) as db:
+            async with self._write() as db:
                 cursor = await db.execute(
                     """
-                    INSERT INTO category_configs 
-                    (guild_id, slug, name, channel_id, schedule_type, schedule_time, 
+                    INSERT INTO category_configs
+                    (guild_id, slug, name, channel_id, schedule_type, schedule_time,
                      schedule_day, schedule_date, min_temperature, max_price)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (guild_id, slug, name, channel_id, schedule_type, schedule_time,
                      schedule_day, schedule_date, min_temperature, max_price),
                 )
-                await db.commit()
-                return cursor.lastrowid
+            self._invalidate_categories()
+            return cursor.lastrowid
         except aiosqlite.IntegrityError:
             logger.warning(f"Category {slug} already exists for guild {guild_id}")
             return None
@@ -263,109 +629,144 @@ class Database:
             return None
 
     async def remove_category_config(self, guild_id: int, slug: str) -> bool:
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 "DELETE FROM category_configs WHERE guild_id = ? AND slug = ?",
                 (guild_id, slug),
             )
-            await db.commit()
-            return cursor.rowcount > 0
-
-    async def get_guild_categories(self, guild_id: int, status: str = None) -> List[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            if status:
-                query = "SELECT * FROM category_configs WHERE guild_id = ? AND status = ?"
-                params = (guild_id, status)
-            else:
-                query = "SELECT * FROM category_configs WHERE guild_id = ?"
-                params = (guild_id,)
-            
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-
-    async def get_category_by_slug(self, guild_id: int, slug: str) -> Optional[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM category_configs WHERE guild_id = ? AND slug = ?",
-                (guild_id, slug),
-            ) as cursor:
-                row = await cursor.fetchone()
-                return dict(row) if row else None
+        self._invalidate_categories()
+        return cursor.rowcount > 0
+
+    def _invalidate_categories(self):
+        self._category_generation += 1
+        self._category_cache.clear()
+
+    async def _cached_categories(self, key: tuple, query: str, params: tuple) -> List[Category]:
+        cached = self._category_cache.get(key)
+        if cached is None:
+            generation = self._category_generation
+            async with self._reader() as db, db.execute(query, params) as cursor:
+                cursor.row_factory = _category_row_factory
+                cursor.arraysize = FETCH_CHUNK_SIZE
+                cached = [category async for category in cursor]
+            if generation == self._category_generation:
+                self._category_cache[key] = cached
+        # Hand out copies so a caller changing a Category can't alter the cached rows
+        return [copy.copy(category) for category in cached]
+
+    async def get_guild_categories(self, guild_id: int, status: str = None) -> List[Category]:
+        if status:
+            query = f"{_CATEGORY_SELECT} WHERE guild_id = ? AND status = ?"
+            params = (guild_id, status)
+        else:
+            query = f"{_CATEGORY_SELECT} WHERE guild_id = ?"
+            params = (guild_id,)
+
+        return await self._cached_categories(("guild", guild_id, status), query, params)
+
+    async def get_category_by_slug(self, guild_id: int, slug: str) -> Optional[Category]:
+        async with self._reader() as db, db.execute(
+            f"{_CATEGORY_SELECT} WHERE guild_id = ? AND slug = ?",
+            (guild_id, slug),
+        ) as cursor:
+            cursor.row_factory = _category_row_factory
+            return await cursor.fetchone()
 
     async def update_category_status(self, guild_id: int, slug: str, status: str) -> bool:
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 """
-                UPDATE category_configs 
-                SET status = ?, updated_at = CURRENT_TIMESTAMP 
+                UPDATE category_configs
+                SET status = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE guild_id = ? AND slug = ?
                 """,
                 (status, guild_id, slug),
             )
-            await db.commit()
-            return cursor.rowcount > 0
+        self._invalidate_categories()
+        return cursor.rowcount > 0
 
     async def update_category_last_run(self, category_id: int):
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             await db.execute(
-                "UPDATE category_configs SET last_run = CURRENT_TIMESTAMP WHERE id = ?",
-                (category_id,),
+                "UPDATE category_configs SET last_run = ? WHERE id = ?",
+                (time.time(), category_id),
             )
-            await db.commit()
-
-    async def get_active_categories_for_schedule(self) -> List[Dict[str, Any]]:
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM category_configs WHERE status = 'active' ORDER BY guild_id, id"
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
-
-    async def is_category_deal_sent(self, category_id: int, deal_id: str) -> bool:
-        async with aiosqlite.connect(self.db_name) as db:
-            async with db.execute(
-                "SELECT 1 FROM category_sent_deals WHERE category_id = ? AND deal_id = ?",
-                (category_id, deal_id),
+        self._invalidate_categories()
+
+    async def get_active_categories_for_schedule(self) -> List[Category]:
+        return await self._cached_categories(
+            ("active",),
+            f"{_CATEGORY_SELECT} WHERE status = 'active' ORDER BY guild_id, id",
+            (),
+        )
+
+    async def get_category_sent_deal_ids(self, category_id: int, deal_ids: Iterable[str]) -> Set[str]:
+        """Returns the subset of deal_ids already posted for this category."""
+        sent = set()
+        misses = []
+        for deal_id in deal_ids:
+            if (category_id, deal_id) in self._category_sent_cache:
+                sent.add(deal_id)
+            else:
+                misses.append(deal_id)
+
+        for i in range(0, len(misses), IN_CLAUSE_CHUNK_SIZE):
+            chunk = misses[i:i + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            # Only "?" markers are interpolated; the deal ids stay bound parameters.
+            async with self._reader() as db, db.execute(
+                f"SELECT deal_id FROM category_sent_deals "  # noqa: S608
+                f"WHERE category_id = ? AND deal_id IN ({placeholders})",
+                (category_id, *chunk),
             ) as cursor:
-                return await cursor.fetchone() is not None
+                cursor.arraysize = FETCH_CHUNK_SIZE
+                async for row in cursor:
+                    sent.add(row[0])
+                    self._category_sent_cache.add((category_id, row[0]))
+        return sent
 
     async def mark_category_deal_sent(self, category_id: int, deal_id: str):
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
-                "INSERT OR IGNORE INTO category_sent_deals (category_id, deal_id) VALUES (?, ?)",
-                (category_id, deal_id),
-            )
-            await db.commit()
+        """Deprecated: use mark_category_deals_sent_batch or transaction()."""
+        _warn_single_row_writer("mark_category_deal_sent")
+        async with self._write() as db:
+            await db.execute(_SQL_INSERT_CATEGORY_DEAL, (category_id, deal_id))
+        self._category_sent_cache.add((category_id, deal_id))
 
     async def mark_category_deals_sent_batch(self, records: List[tuple]):
         if not records:
             return
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             await db.executemany(
-                "INSERT OR IGNORE INTO category_sent_deals (category_id, deal_id) VALUES (?, ?)",
+                _SQL_INSERT_CATEGORY_DEAL,
                 records,
             )
-            await db.commit()
+        self._category_sent_cache.update(records)
 
     async def cleanup_category_deals(self, days: int = 30):
         """Clean up old category sent deals to prevent database bloat."""
-        async with aiosqlite.connect(self.db_name) as db:
+        async with self._write() as db:
             cursor = await db.execute(
                 "DELETE FROM category_sent_deals WHERE sent_at < datetime('now', ?)",
                 (f"-{days} days",),
             )
             deleted = cursor.rowcount
-            await db.commit()
-            logger.info(f"Cleaned up {deleted} old category deals (older than {days} days)")
-            return deleted
+        self._category_sent_cache.clear()
+        logger.info(f"Cleaned up {deleted} old category deals (older than {days} days)")
+        return deleted
 
     async def update_category_stats(self, category_id: int, deals_found: int, deals_sent: int, errors: int = 0):
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(
+        await self.update_category_stats_batch([(category_id, deals_found, deals_sent, errors)])
+
+    async def update_category_stats_batch(self, rows: List[Tuple[int, int, int, int]]):
+        """Add today's stats for many categories in one transaction.
+
+        Args:
+            rows: List of (category_id, deals_found, deals_sent, errors) tuples
+        """
+        if not rows:
+            return
+        async with self._write() as db:
+            await db.executemany(
                 """
                 INSERT INTO category_stats (category_id, date, deals_found, deals_sent, scrape_errors)
                 VALUES (?, DATE('now'), ?, ?, ?)
@@ -374,6 +775,5 @@ class Database:
                     deals_sent = deals_sent + excluded.deals_sent,
                     scrape_errors = scrape_errors + excluded.scrape_errors
                 """,
-                (category_id, deals_found, deals_sent, errors),
+                rows,
             )
-            await db.commit()
\ No newline at end of file
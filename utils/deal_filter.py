@@ -8,6 +8,8 @@ FRESHNESS_CUTOFF_HOURS = 24
 MIN_TEMPERATURE = 50
 MAX_REASONABLE_PRICE = 1000000
 
+_PRICE_TRANS = str.maketrans({",": ".", " ": None})
+
 
 class DealFilter: 
     @staticmethod
@@ -96,11 +98,12 @@ class DealFilter:
         if not price_str:
             return None
         
+        clean = price_str.lower().translate(_PRICE_TRANS)
+        if "darm" in clean or "free" in clean or "bezpłatn" in clean:
+            return 0.0
+
         try:
-            clean = price_str.lower().replace("zł", "").replace(" ", "").replace(",", ".")
-            if any(keyword in clean for keyword in ["darm", "free", "bezpłatn"]):
-                return 0.0  
-            return float(clean)
+            return float(clean.removesuffix("zł"))
         
         except ValueError:
             logger.warning(f"Failed to parse price: {price_str}")
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+DAY_INDEX = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+# Column order expected by Category.from_tuple; queries select exactly these columns
+CATEGORY_COLUMNS = (
+    'id', 'guild_id', 'slug', 'name', 'channel_id', 'status',
+    'schedule_type', 'schedule_time', 'schedule_day', 'schedule_date',
+    'min_temperature', 'max_price', 'last_run',
+)
+
+
+@dataclass(slots=True)
+class Category:
+    """A category_configs row with its schedule pre-parsed for the scheduler."""
+
+    id: int
+    guild_id: int
+    slug: str
+    name: Optional[str]
+    channel_id: int
+    status: str
+    schedule_type: str
+    schedule_time: str
+    schedule_day: Optional[str]
+    schedule_date: Optional[int]
+    schedule_hour: int
+    schedule_minute: int
+    schedule_day_idx: int  # 0-6 (Monday-Sunday), -1 when no day is set
+    schedule_day_display: str  # Capitalized day name for embeds, '' when no day is set
+    min_temperature: int
+    max_price: Optional[float]
+    last_run_ts: float  # Unix timestamp, 0.0 when never run
+
+    @classmethod
+    def from_tuple(cls, row: Sequence) -> "Category":
+        """Build from a plain tuple row whose columns follow CATEGORY_COLUMNS."""
+        (category_id, guild_id, slug, name, channel_id, status,
+         schedule_type, schedule_time, schedule_day, schedule_date,
+         min_temperature, max_price, last_run) = row
+        hour, minute = schedule_time.split(':')
+        return cls(
+            id=category_id,
+            guild_id=guild_id,
+            slug=slug,
+            name=name,
+            channel_id=channel_id,
+            status=status,
+            schedule_type=schedule_type,
+            schedule_time=schedule_time,
+            schedule_day=schedule_day,
+            schedule_date=schedule_date,
+            schedule_hour=int(hour),
+            schedule_minute=int(minute),
+            schedule_day_idx=DAY_INDEX.get(schedule_day, -1),
+            schedule_day_display=(schedule_day or '').capitalize(),
+            min_temperature=min_temperature or 0,
+            max_price=max_price,
+            last_run_ts=float(last_run or 0.0),
+        )
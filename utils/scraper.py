@@ -8,6 +8,8 @@ from urllib.parse import quote
 import aiohttp
 from selectolax.parser import HTMLParser
 
+from .config import FLIGHT_CATEGORY_URL, GROUP_URL_TEMPLATE
+
 logger = logging.getLogger("PepperBot.Scraper")
 
 
@@ -40,16 +42,12 @@ class PepperScraper:
         return await self._fetch_and_parse(self.BASE_URL, limit, context="hot deals")
 
     async def get_group_deals(self, group_slug: str, limit: int = 7) -> Dict[str, Any]:
-        from .config import Config
-
-        url = Config.GROUP_URL_TEMPLATE.format(group_slug)
+        url = GROUP_URL_TEMPLATE.format(group_slug)
         return await self._fetch_and_parse(url, limit, context=f"group: {group_slug}")
 
     async def get_flight_deals(self, limit: int = 10) -> Dict[str, Any]:
-        from .config import Config
-
         return await self._fetch_and_parse(
-            Config.FLIGHT_CATEGORY_URL, limit, context="flight deals"
+            FLIGHT_CATEGORY_URL, limit, context="flight deals"
         )
 
     async def _fetch_and_parse(
@@ -58,9 +56,7 @@ class PepperScraper:
         for attempt in range(retries):
             try:
                 logger.info(f"Fetching {context} from: {url} (Attempt {attempt + 1}/{retries})")
-                async with self.session.get(
-                    url, headers=self.DEFAULT_HEADERS, timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
+                async with self.session.get(url, headers=self.DEFAULT_HEADERS) as response:
                     if response.status != 200:
                         logger.warning(f"HTTP {response.status} for {url}")
                         if response.status in [429, 500, 502, 503, 504]:
@@ -1,8 +1,24 @@
-from typing import Any, Dict, List
+import bisect
+from typing import Any, Dict, List, Tuple
 
 import discord
 
-from .config import Config
+from .config import COLOR_PRIMARY
+
+# Temperatures are ints: <1 -> ❄️, 1-99 -> 👍, 100-499 -> 🔥, 500+ -> 🌋
+_TEMP_THRESHOLDS = (1, 100, 500)
+_TEMP_EMOJIS = ("❄️", "👍", "🔥", "🌋")
+
+
+def _format_deal(deal: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Returns the (price_text, emoji, temp_display) shown for a deal."""
+    price_text = "Darmowa" if deal.get("price") == "0 zł" else (deal["price"] or "---")
+    if deal["next_best_price"]:
+        price_text += f"  ~~{deal['next_best_price']}~~"
+
+    temp = deal["temperature"]
+    emoji = _TEMP_EMOJIS[bisect.bisect_right(_TEMP_THRESHOLDS, temp)]
+    return price_text, emoji, f"{temp}°"
 
 
 class DealPaginator(discord.ui.View):
@@ -22,35 +38,31 @@ class DealPaginator(discord.ui.View):
         self.btn_close = discord.ui.Button(label="🗑️", style=discord.ButtonStyle.danger)
         self.btn_close.callback = self.on_close
 
+        # Per-deal strings are formatted once; the Embed itself is built per page flip and not kept
+        formatted = [_format_deal(deal) for deal in deals]
+        self._titles: List[str] = [deal["title"][:250] for deal in deals]
+        self._prices: List[str] = [f"**{price_text}**" for price_text, _, _ in formatted]
+        self._emojis: List[str] = [f"{emoji} Ocena" for _, emoji, _ in formatted]
+        self._temps: List[str] = [temp_display for _, _, temp_display in formatted]
+        self._footers: List[str] = [
+            f"Okazja {i} z {self.total_pages} • Pepper.pl" for i in range(1, self.total_pages + 1)
+        ]
+
         self._refresh_view()
 
     def _create_embed(self) -> discord.Embed:
-        deal = self.deals[self.current_page]
+        i = self.current_page
+        deal = self.deals[i]
 
         embed = discord.Embed(
-            title=deal["title"][:250],
+            title=self._titles[i],
             url=deal["link"] if deal["link"] else None,
-            color=Config.COLOR_PRIMARY,
+            color=COLOR_PRIMARY,
         )
 
-        price_text = "Darmowa" if deal.get("price") == "0 zł" else (deal["price"] or "---")
-        if deal["next_best_price"]:
-            price_text += f"  ~~{deal['next_best_price']}~~"
-
-        embed.add_field(name="💰 Cena", value=f"**{price_text}**", inline=True)
+        embed.add_field(name="💰 Cena", value=self._prices[i], inline=True)
         embed.add_field(name="🏪 Sklep", value=deal["merchant"], inline=True)
-
-        temp = deal["temperature"]
-        if temp >= 500:
-            emoji = "🌋"
-        elif temp >= 100:
-            emoji = "🔥"
-        elif temp > 0:
-            emoji = "👍"
-        else:
-            emoji = "❄️"
-
-        embed.add_field(name=f"{emoji} Ocena", value=f"{temp}°", inline=True)
+        embed.add_field(name=self._emojis[i], value=self._temps[i], inline=True)
 
         if deal["voucher_code"]:
             embed.add_field(name="🎫 Kod", value=f"```\n{deal['voucher_code']}\n```", inline=False)
@@ -59,7 +71,7 @@ class DealPaginator(discord.ui.View):
             embed.set_thumbnail(url=deal["image_url"])
 
         embed.set_footer(
-            text=f"Okazja {self.current_page + 1} z {self.total_pages} • Pepper.pl",
+            text=self._footers[i],
             icon_url="https://static.pepper.pl/assets/img/favicons/favicon-32x32.png",
         )
         return embed